@@ -5,7 +5,6 @@
 to update appliances every five minutes and to turn on our oven the first time we see it.  Because that is safe!
 """
 
-import aiohttp
 import asyncio
 import logging
 from datetime import timedelta
@@ -24,6 +23,7 @@
     OVEN_COOK_MODE_MAP
 )
 from examples.credentials import USERNAME, PASSWORD
+from gehomesdk.gather_data import start_periodic_update
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -54,14 +54,6 @@ async def detect_appliance_type(appliance: GeAppliance):
         await appliance.async_set_erd_value(ErdCode.UPPER_OVEN_KITCHEN_TIMER, timedelta(minutes=45))
         pass
 
-async def do_periodic_update(appliance: GeAppliance):
-    """Request a full state update every minute forever"""
-    _LOGGER.debug(f'Registering update callback for {appliance:s}')
-    while True:
-        await asyncio.sleep(60 * 1)
-        _LOGGER.debug(f'Requesting update for {appliance:s}')
-        await appliance.async_request_update()
-
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG, format='%(levelname)-8s %(message)s')
 
@@ -69,8 +61,7 @@ async def do_periodic_update(appliance: GeAppliance):
     client = GeXmppClient(USERNAME, PASSWORD, loop)
     client.add_event_handler(EVENT_APPLIANCE_INITIAL_UPDATE, detect_appliance_type)
     client.add_event_handler(EVENT_APPLIANCE_STATE_CHANGE, log_state_change)
-    client.add_event_handler(EVENT_ADD_APPLIANCE, do_periodic_update)
+    client.add_event_handler(EVENT_ADD_APPLIANCE, start_periodic_update)
 
-    session = aiohttp.ClientSession()
-    asyncio.ensure_future(client.async_get_credentials_and_run(session), loop=loop)
+    asyncio.ensure_future(client.async_get_credentials_and_run(), loop=loop)
     loop.run_until_complete(asyncio.sleep(7400))
@@ -1,8 +1,11 @@
+from html import unescape
 from http.cookies import SimpleCookie
-from aiohttp import BasicAuth, ClientSession
-from lxml import etree
-from urllib.parse import urlparse, parse_qs
+from aiohttp import BasicAuth, ClientConnectionError, ClientSession
+import asyncio
+from typing import Dict, Optional
 import logging
+import random
+from yarl import URL
 
 from ..exception import *
 from .const import (
@@ -12,7 +15,11 @@
     LOGIN_URL, 
     OAUTH2_CLIENT_ID, 
     OAUTH2_CLIENT_SECRET,
-    OAUTH2_REDIRECT_URI
+    OAUTH2_REDIRECT_URI,
+    OAUTH_RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_JITTER,
+    RETRY_MAX_DELAY,
 )
 
 try:
@@ -20,8 +27,48 @@
 except ImportError:
     import re
 
+try:
+    import ujson as json
+except ImportError:
+    import json
+
 _LOGGER = logging.getLogger(__name__)  
 
+_AUTH_URL = f'{LOGIN_URL}/oauth2/auth'
+_AUTHENTICATE_URL = f'{LOGIN_URL}/oauth2/g_authenticate'
+_CODE_URL = f'{LOGIN_URL}/oauth2/code'
+_TOKEN_URL = f'{LOGIN_URL}/oauth2/token'
+_OAUTH_BASIC_AUTH = BasicAuth(OAUTH2_CLIENT_ID, OAUTH2_CLIENT_SECRET)
+
+#patterns are compiled once at import with whichever engine was imported above, so
+#re2 builds its automata a single time instead of on every login
+_EMAIL_RE = re.compile(
+    r'^\s*(\w+(?:(?:-\w+)|(?:\.\w+)|(?:\+\w+))*\@'
+    r'[A-Za-z0-9]+(?:(?:\.|-)[A-Za-z0-9]+)*\.[A-Za-z0-9][A-Za-z0-9]+)\s*$'
+)
+_FORM_RE = re.compile(r'(?is)<form\b[^>]*\sid\s*=\s*(?:"frmsignin"|\'frmsignin\'|frmsignin)(?:\s[^>]*)?>(.*?)</form>')
+_INPUT_RE = re.compile(r'(?i)<input\b((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>')
+_ATTR_RE = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+_COMMENT_RE = re.compile(r'(?s)<!--.*?-->')
+_ALERT_RE = re.compile(r'(?is)<div\b[^>]*\sid\s*=\s*(?:"alert_pane"|\'alert_pane\'|alert_pane)(?:\s[^>]*)?>([^<]*)')
+
+def _get_signin_form_values(resp_text: str) -> Dict[str, str]:
+    """Pulls the named input values out of the sign in form"""
+    #lxml ignored commented out markup, so drop it before scanning
+    form = _FORM_RE.search(_COMMENT_RE.sub('', resp_text))
+    if form is None:
+        return {}
+
+    values = {}
+    for input_attrs in _INPUT_RE.findall(form.group(1)):
+        attrs = {
+            name.lower(): unescape(dquoted or squoted or unquoted)
+            for name, dquoted, squoted, unquoted in _ATTR_RE.findall(input_attrs)
+        }
+        if 'name' in attrs and 'value' in attrs:
+            values[attrs['name']] = attrs['value']
+    return values
+
 def set_login_cookie(session: ClientSession, account_region: str):
     c = SimpleCookie()
     c[LOGIN_REGION_COOKIE_NAME] = LOGIN_REGIONS[account_region]
@@ -42,29 +89,24 @@ async def async_get_authorization_code(session: ClientSession, account_username:
 
     set_login_cookie(session, account_region)
 
-    async with session.get(f'{LOGIN_URL}/oauth2/auth', params=params) as resp:
+    async with session.get(_AUTH_URL, params=params) as resp:
         if 400 <= resp.status < 500:
             raise GeAuthFailedError(await resp.text())
         if resp.status >= 500:
             raise GeGeneralServerError(await resp.text())
         resp_text = await resp.text()
 
-    email_regex = (
-        r'^\s*(\w+(?:(?:-\w+)|(?:\.\w+)|(?:\+\w+))*\@'
-        r'[A-Za-z0-9]+(?:(?:\.|-)[A-Za-z0-9]+)*\.[A-Za-z0-9][A-Za-z0-9]+)\s*$'
-    )
-    clean_username = re.sub(email_regex, r'\1', account_username)
+    #the regex only trims whitespace around a valid email, so skip it when there's nothing to trim
+    if account_username == account_username.strip():
+        clean_username = account_username
+    else:
+        clean_username = _EMAIL_RE.sub(r'\1', account_username)
 
-    etr = etree.HTML(resp_text)
-    post_data = {
-        i.attrib['name']: i.attrib['value']
-        for i in etr.xpath("//form[@id = 'frmsignin']//input")
-        if 'value' in i.keys()
-    }
+    post_data = _get_signin_form_values(resp_text)
     post_data['username'] = clean_username
     post_data['password'] = account_password
 
-    async with session.post(f'{LOGIN_URL}/oauth2/g_authenticate', data=post_data, allow_redirects=False) as resp:
+    async with session.post(_AUTHENTICATE_URL, data=post_data, allow_redirects=False) as resp:
         if 400 <= resp.status < 500:
             raise GeAuthFailedError(f"Problem with request, code: {resp.status}")
         if resp.status >= 500:
@@ -76,7 +118,7 @@ async def async_get_authorization_code(session: ClientSession, account_username:
                 code = await async_handle_ok_response(session, await resp.text())
             else:
                 #assume response has a location header from which we can get a code
-                code = parse_qs(urlparse(resp.headers['Location']).query)['code'][0]
+                code = URL(resp.headers['Location']).query['code']
         except Exception as exc:
             resp_text = await resp.text()
             _LOGGER.exception(f"There was a problem getting the authorization code, response details: {resp.__dict__}")
@@ -86,19 +128,8 @@ async def async_get_authorization_code(session: ClientSession, account_username:
 async def async_handle_ok_response(session: ClientSession, resp_text: str) -> str:
     """Handles an OK 200 response from the login process"""
 
-    #parse the response into html
-    etr = etree.HTML(resp_text)
-    post_data = {}
-
-    try:
-        #first try to pull all the form values    
-        post_data = {
-            i.attrib['name']: i.attrib['value']
-            for i in etr.xpath("//form[@id = 'frmsignin']//input")
-            if 'value' in i.keys()
-        }
-    except:
-        pass
+    #first try to pull all the form values    
+    post_data = _get_signin_form_values(resp_text)
 
     #if we have an authorized key, try to authorize the application
     if "authorized" in post_data:
@@ -107,7 +138,7 @@ async def async_handle_ok_response(session: ClientSession, resp_text: str) -> st
 
     #try to get the error based on the known responses
     try:
-        reason = etr.find(".//div[@id='alert_pane']").text.translate({ord(c):"" for c in "\t\n"})
+        reason = unescape(_ALERT_RE.search(_COMMENT_RE.sub('', resp_text)).group(1)).translate({ord(c):"" for c in "\t\n"})
         raise GeAuthFailedError(f"Authentication failed, reason: {reason}")
     except GeAuthFailedError:
         raise #re-raise only auth failed errors, all others are irrelevant at this point
@@ -126,20 +157,47 @@ async def async_authorize_application(session: ClientSession, post_data: dict) -
 
     post_data["authorized"] = "yes"
 
-    async with session.post(f'{LOGIN_URL}/oauth2/code', data=post_data, allow_redirects=False) as resp:
+    async with session.post(_CODE_URL, data=post_data, allow_redirects=False) as resp:
         if 400 <= resp.status < 500:
             raise GeAuthFailedError(f"Problem with request, code: {resp.status}")
         if resp.status >= 500:
             raise GeGeneralServerError(f"Server error, code: {resp.status}")
         try:
             #oauth2/code appears to give the same header as we expect in the normal case, so let's try to use it
-            code = parse_qs(urlparse(resp.headers['Location']).query)['code'][0]
+            code = URL(resp.headers['Location']).query['code']
         except Exception as exc:
             resp_text = await resp.text()
             _LOGGER.exception(f"There was a problem authorizing the application, response details: {resp.__dict__}")
             raise GeAuthFailedError(f'Could not authorize application') from exc
     return code    
 
+async def _async_oauth_post(session: ClientSession, url: str, data: dict, auth: Optional[BasicAuth] = None) -> dict:
+    """
+    Posts to an OAuth endpoint, classifying the response status and decoding the JSON body.
+    Server errors and connection problems are retried with backoff, auth failures are not.
+    """
+    for attempt in range(OAUTH_RETRY_ATTEMPTS):
+        try:
+            async with session.post(url, data=data, auth=auth) as resp:
+                if 400 <= resp.status < 500:
+                    raise GeAuthFailedError(f"Problem with request, code: {resp.status}")
+                if resp.status >= 500:
+                    raise GeGeneralServerError(f"Server error, code: {resp.status}")
+                return await resp.json(loads=json.loads)
+        except (GeGeneralServerError, ClientConnectionError, asyncio.TimeoutError) as err:
+            if attempt + 1 >= OAUTH_RETRY_ATTEMPTS:
+                raise
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)) * (1 + random.random() * RETRY_JITTER)
+            _LOGGER.debug(f"OAuth request failed ({err}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+async def _async_get_token(session: ClientSession, post_data: dict) -> dict:
+    """Requests a token from the OAuth token endpoint"""
+    oauth_token = await _async_oauth_post(session, _TOKEN_URL, post_data, _OAUTH_BASIC_AUTH)
+    if 'access_token' not in oauth_token:
+        raise GeAuthFailedError(f'Failed to get a token: {oauth_token}')
+    return oauth_token
+
 async def async_get_oauth2_token(session: ClientSession, account_username: str, account_password: str, account_region: str):
     """Hackily get an oauth2 token until I can be bothered to do this correctly"""
 
@@ -155,23 +213,9 @@ async def async_get_oauth2_token(session: ClientSession, account_username: str,
         'grant_type': 'authorization_code',
     }
     try:
-        auth = BasicAuth(OAUTH2_CLIENT_ID, OAUTH2_CLIENT_SECRET)
-        async with session.post(f'{LOGIN_URL}/oauth2/token', data=post_data, auth=auth) as resp:
-            if 400 <= resp.status < 500:
-                raise GeAuthFailedError(f"Problem with request, code: {resp.status}")
-            if resp.status >= 500:
-                raise GeGeneralServerError(f"Server error, code: {resp.status}")
-            oauth_token = await resp.json()
-        try:
-            access_token = oauth_token['access_token']
-            return oauth_token
-        except KeyError:
-            raise GeAuthFailedError(f'Failed to get a token: {oauth_token}')
-        except Exception as exc:
-            resp_text = await resp.text()
-            _LOGGER.exception(f"Could not get OAuth token, response details: {resp.__dict__}")
-            raise GeAuthFailedError(f'Could not get OAuth token') from exc
+        return await _async_get_token(session, post_data)
     except Exception as exc:
+        _LOGGER.debug(f"Could not get OAuth token: {exc}")
         raise GeAuthFailedError(f'Could not get OAuth token') from exc
 
 async def async_refresh_oauth2_token(session: ClientSession, refresh_token: str):
@@ -185,22 +229,7 @@ async def async_refresh_oauth2_token(session: ClientSession, refresh_token: str)
         'refresh_token': refresh_token
     }
     try:
-        auth = BasicAuth(OAUTH2_CLIENT_ID, OAUTH2_CLIENT_SECRET)
-        async with session.post(f'{LOGIN_URL}/oauth2/token', data=post_data, auth=auth) as resp:
-            if 400 <= resp.status < 500:
-                raise GeAuthFailedError(f"Problem with request, code: {resp.status}")
-            if resp.status >= 500:
-                raise GeGeneralServerError(f"Server error, code: {resp.status}")
-            oauth_token = await resp.json()
-        try:
-            access_token = oauth_token['access_token']
-            return oauth_token
-        except KeyError:
-            raise GeAuthFailedError(f'Failed to get a token: {oauth_token}')
-        except Exception as exc:
-            resp_text = await resp.text()
-            _LOGGER.exception(f"Could not refresh OAuth token, response details: {resp.__dict__}")
-            raise GeAuthFailedError(f'Could not refresh OAuth token') from exc
+        return await _async_get_token(session, post_data)
     except Exception as exc:
+        _LOGGER.debug(f"Could not refresh OAuth token: {exc}")
         raise GeAuthFailedError(f'Could not refresh OAuth token') from exc
-
@@ -2,12 +2,13 @@
 
 import abc
 from gehomesdk.clients.async_login_flows import async_get_oauth2_token, async_refresh_oauth2_token
-from aiohttp import ClientSession
+from aiohttp import ClientSession, TCPConnector
 import asyncio
-from collections import defaultdict
-from datetime import datetime, timedelta
 import logging
+import random
+import time
 from typing import Any, Callable, Dict, List, Optional, Tuple
+import warnings
 
 from ..erd import ErdCode, ErdCodeType
 from ..exception import *
@@ -19,28 +20,77 @@
     EVENT_CONNECTED, 
     EVENT_DISCONNECTED, 
     EVENT_STATE_CHANGED,
+    HTTP_CONNECTION_LIMIT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
     MAX_RETRIES, 
     RETRY_INTERVAL,
+    RETRY_JITTER,
+    RETRY_MAX_DELAY,
+    TOKEN_REFRESH_WINDOW,
 )
 from .states import GeClientState
 
 _LOGGER = logging.getLogger(__name__)
 
+_SESSION_DEPRECATION_MESSAGE = 'Passing a session is deprecated, the client now manages its own session'
+
 class GeBaseClient(metaclass=abc.ABCMeta):
-    """Abstract base class for GE ERD APIs"""
+    """
+    Abstract base class for GE ERD APIs
+
+    The client manages its own HTTP session, which is best scoped by using the
+    client as an async context manager::
+
+        async with GeWebsocketClient(username, password, region) as client:
+            await client.async_get_credentials_and_run()
+
+    Outside of a context manager the session lives for a single call: it is closed
+    when async_get_credentials returns or when async_run_client stops.
+    """
 
     client_priority = 0  # Priority of this client class.  Higher is better.
 
+    # subclasses should declare their own __slots__ to avoid a per-instance __dict__
+    __slots__ = (
+        '__weakref__',
+        'account_username',
+        'account_password',
+        'account_region',
+        '_credentials',
+        '_session',
+        '_owns_session',
+        '_session_scoped',
+        '_access_token',
+        '_refresh_token',
+        '_token_expiration_time',
+        '_token_lock',
+        '_refresh_task',
+        '_refresh_enabled',
+        '_state',
+        '_disconnect_requested',
+        '_retries_since_last_connect',
+        '_has_successful_connect',
+        '_loop',
+        '_appliances',
+        '_event_handlers',
+    )
+
     def __init__(self, username: str, password: str, region: str = "US", event_loop: Optional[asyncio.AbstractEventLoop] = None):
         self.account_username = username
         self.account_password = password
         self.account_region = region
         self._credentials = None  # type: Optional[Dict]
         self._session = None # type: Optional[ClientSession]
+        self._owns_session = False
+        self._session_scoped = False
 
         self._access_token = None
         self._refresh_token = None
-        self._token_expiration_time = datetime.now()
+        self._token_expiration_time = time.monotonic()
+        self._token_lock = asyncio.Lock()
+        self._refresh_task = None  # type: Optional[asyncio.Task]
+        self._refresh_enabled = False
 
         self._state = GeClientState.INITIALIZING
         self._disconnect_requested = asyncio.Event()
@@ -76,7 +126,7 @@ def state(self) -> GeClientState:
     @property
     def loop(self) -> asyncio.AbstractEventLoop:
         if self._loop is None:
-            self._loop = asyncio.get_event_loop()
+            self._loop = asyncio.get_running_loop()
         return self._loop
 
     @property
@@ -90,39 +140,106 @@ def available(self) -> bool:
         return self._state == GeClientState.CONNECTED
 
     @property
-    def event_handlers(self) -> Dict[str, List[Callable]]:
+    def event_handlers(self) -> Dict[str, Tuple[Callable, ...]]:
         return self._event_handlers
 
     async def async_event(self, event: str, *args, **kwargs):
-        _LOGGER.debug(f"received event: {event}, processing callbacks...")
-        """Trigger event callbacks sequentially"""
-        for cb in self.event_handlers[event]:
-            _LOGGER.debug(f"processing callback: {cb}")
-            asyncio.ensure_future(cb(*args, **kwargs), loop=self.loop)
+        """
+        Trigger event callbacks concurrently and wait for them to complete.
+        Long running callbacks should schedule their own task.
+        """
+        handlers = self._event_handlers.get(event, ())
+        if not handlers:
+            return
+        _LOGGER.debug(f"received event: {event}, processing {len(handlers)} callbacks...")
+        results = await asyncio.gather(*(cb(*args, **kwargs) for cb in handlers), return_exceptions=True)
+        for cb, result in zip(handlers, results):
+            if isinstance(result, Exception):
+                _LOGGER.error(f"error processing callback {cb} for event {event}", exc_info=result)
 
     def add_event_handler(self, event: str, callback: Callable, disposable: bool = False):
         if disposable:
             raise NotImplementedError('Support for disposable callbacks not yet implemented')
-        self.event_handlers[event].append(callback)
+        #handlers are stored as tuples so dispatch can iterate a snapshot without copying
+        self._event_handlers[event] = self._event_handlers.get(event, ()) + (callback,)
 
     def remove_event_handler(self, event: str, callback: Callable):
+        handlers = self._event_handlers.get(event, ())
         try:
-            self.event_handlers[event].remove(callable)
-        except:
-            _LOGGER.warn(f"could not remove event handler {event}-{callable}")
+            index = handlers.index(callback)
+        except ValueError:
+            _LOGGER.warning(f"could not remove event handler {event}-{callback}")
+            return
+        self._event_handlers[event] = handlers[:index] + handlers[index + 1:]
 
     def clear_event_handlers(self):
         self._initialize_event_handlers()
 
-    async def async_get_credentials_and_run(self, session: ClientSession):
-        """Do a full login flow and run the client."""
-        await self.async_get_credentials(session)
+    async def __aenter__(self):
+        self._bind_loop()
+        self._ensure_session()
+        self._session_scoped = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._session_scoped = False
+        await self.disconnect()
+        self._cancel_token_refresh()
+        #disconnect() is a no-op if the client was already disconnected, but a session may
+        #have been opened since then (e.g. by async_get_credentials), so close it here too
+        await self._async_close_session()
+
+    def _ensure_session(self) -> ClientSession:
+        """Create the client owned HTTP session if there isn't a usable one"""
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(connector=TCPConnector(
+                limit=HTTP_CONNECTION_LIMIT,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT))
+            self._owns_session = True
+        return self._session
+
+    async def _async_close_session(self):
+        """Close the HTTP session if it was created by this client"""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._owns_session = False
+
+    async def async_get_credentials_and_run(self, session: Optional[ClientSession] = None):
+        """
+        Do a full login flow and run the client.
+
+        :param session: Deprecated, the client manages its own session when omitted
+        """
+        if session is not None:
+            warnings.warn(_SESSION_DEPRECATION_MESSAGE, DeprecationWarning, stacklevel=2)
+        await self._async_get_credentials(session)
         await self.async_run_client()
 
+    def _bind_loop(self):
+        """Pin the running loop, unless a loop was passed to the constructor"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+
     async def async_run_client(self):
+        self._bind_loop()
+
         #reset the disconnect event
         self._disconnect_requested.clear()
 
+        #tokens are only refreshed in the background while the client is running
+        self._refresh_enabled = True
+        self._schedule_token_refresh()
+        try:
+            await self._async_run_client_loop()
+        finally:
+            self._refresh_enabled = False
+            self._cancel_token_refresh()
+            if not self._session_scoped:
+                await self._async_close_session()
+
+    async def _async_run_client_loop(self):
         _LOGGER.info('Starting GE Appliances client')
         while not self._disconnect_requested.is_set():
             if self._retries_since_last_connect > MAX_RETRIES:
@@ -144,8 +261,10 @@ async def async_run_client(self):
                 if not self._disconnect_requested.is_set():
                     await self._set_state(GeClientState.DROPPED)
                     await self._set_state(GeClientState.WAITING)
-                    _LOGGER.debug('Waiting before reconnecting')
-                    await asyncio.sleep(RETRY_INTERVAL)
+                    self._retries_since_last_connect += 1
+                    delay = self._get_retry_delay()
+                    _LOGGER.debug(f'Waiting {delay:.1f}s before reconnecting')
+                    await asyncio.sleep(delay)
                     _LOGGER.debug('Refreshing authentication before reconnecting')
                     try:
                         await self.async_do_refresh_login_flow()
@@ -153,11 +272,15 @@ async def async_run_client(self):
                         #if there was an error refreshing the authentication, break the loop and kill the client
                         _LOGGER.warn(f'Error refreshing authentication: {err}')
                         break
-                self._retries_since_last_connect += 1
 
         #initiate the disconnection            
         await self.disconnect()
 
+    def _get_retry_delay(self) -> float:
+        """Exponential backoff with jitter based on the number of retries since the last connect"""
+        delay = min(RETRY_MAX_DELAY, RETRY_INTERVAL * (2 ** max(0, self._retries_since_last_connect)))
+        return delay * (1 + random.random() * RETRY_JITTER)
+
     @abc.abstractmethod
     async def _async_run_client(self):
         """ Internal method to run the client """
@@ -185,13 +308,32 @@ async def async_request_message(self, appliance: GeAppliance):
         """Request notification history"""
         pass
 
-    async def async_get_credentials(self, session: ClientSession):
-        """Get updated credentials"""
-        self._session = session
+    async def async_get_credentials(self, session: Optional[ClientSession] = None):
+        """
+        Get updated credentials
+
+        :param session: Deprecated, the client manages its own session when omitted.
+            A session created by the client is closed before returning unless the
+            client is being used as a context manager.
+        """
+        if session is not None:
+            warnings.warn(_SESSION_DEPRECATION_MESSAGE, DeprecationWarning, stacklevel=2)
+        try:
+            await self._async_get_credentials(session)
+        finally:
+            if not self._session_scoped:
+                await self._async_close_session()
+
+    async def _async_get_credentials(self, session: Optional[ClientSession]):
+        self._bind_loop()
+        if session is not None:
+            await self._async_close_session()
+            self._session = session
         await self.async_do_full_login_flow()
         
     async def async_do_full_login_flow(self) -> Dict[str, str]:
         """Do the full login flow for this client"""
+        self._ensure_session()
         self.credentials = await self._async_do_full_login_flow()
         return self.credentials
 
@@ -202,6 +344,7 @@ async def _async_do_full_login_flow(self) -> Dict[str, str]:
 
     async def async_do_refresh_login_flow(self) -> Dict[str, str]:
         """Do the refresh login flow for this client"""
+        self._ensure_session()
         self.credentials = await self._async_do_refresh_login_flow()
         return self.credentials
 
@@ -215,43 +358,97 @@ async def _async_get_oauth2_token(self):
 
         await self._set_state(GeClientState.AUTHORIZING_OAUTH)
 
-        oauth_token = await async_get_oauth2_token(
-            self._session, 
-            self.account_username, 
-            self.account_password, 
-            self.account_region)
+        async with self._token_lock:
+            oauth_token = await async_get_oauth2_token(
+                self._ensure_session(), 
+                self.account_username, 
+                self.account_password, 
+                self.account_region)
 
-        try:
-            self._access_token = oauth_token['access_token']
-            self._token_expiration_time = datetime.now() + timedelta(seconds=(oauth_token['expires_in'] - 120))
-            self._refresh_token = oauth_token['refresh_token']
-        except KeyError:
-            raise GeAuthFailedError(f'Failed to get a token: {oauth_token}')
+            self._set_oauth2_token(oauth_token)
 
     async def _async_refresh_oauth2_token(self):
         """ Refreshes an OAuth2 Token based on a refresh token """
 
         await self._set_state(GeClientState.AUTHORIZING_OAUTH)
+        async with self._token_lock:
+            await self._async_update_oauth2_token()
+
+    async def _async_update_oauth2_token(self):
+        """ Updates the OAuth2 token without changing the client state, the token lock must be held """
 
         # first try the standard refresh token
         # if we get an exception, try the full login
         # if that has an exception, just raise the original
         # exception
+        session = self._ensure_session()
         try:
-            oauth_token = await async_refresh_oauth2_token(self._session, self._refresh_token)
+            oauth_token = await async_refresh_oauth2_token(session, self._refresh_token)
         except Exception as exc:
             try:
-                oauth_token = await self._async_get_oauth2_token(self)
+                oauth_token = await async_get_oauth2_token(
+                    session, 
+                    self.account_username, 
+                    self.account_password, 
+                    self.account_region)
             except:
                 _LOGGER.warning("Error occurred when retrying token refresh using full flow, ignoring.")
                 raise exc
 
+        self._set_oauth2_token(oauth_token)
+
+    def _set_oauth2_token(self, oauth_token: Dict):
+        """ Stores the values from an OAuth2 token response """
         try:
             self._access_token = oauth_token['access_token']
-            self._token_expiration_time = datetime.now() + timedelta(seconds=(oauth_token['expires_in'] - 120))
+            self._token_expiration_time = time.monotonic() + (oauth_token['expires_in'] - 120)
             self._refresh_token = oauth_token.get('refresh_token', self._refresh_token)
         except KeyError:
             raise GeAuthFailedError(f'Failed to get a token: {oauth_token}')
+        self._schedule_token_refresh()
+
+    def _schedule_token_refresh(self):
+        """ Schedules a background refresh shortly before the current token expires """
+        #the background refresh stores its own token, so don't cancel the task we're running in
+        if self._refresh_task is not asyncio.current_task():
+            self._cancel_token_refresh()
+        if not self._refresh_enabled:
+            return
+        remaining = self._token_expiration_time - time.monotonic()
+        if remaining <= 0:
+            return
+        #short lived tokens are refreshed halfway through their lifetime instead
+        delay = max(remaining / 2, remaining - TOKEN_REFRESH_WINDOW)
+        self._refresh_task = asyncio.create_task(self._async_background_refresh(delay))
+
+    async def _async_background_refresh(self, delay: float):
+        """ Refreshes the OAuth2 token ahead of its expiration """
+        await asyncio.sleep(delay)
+        async with self._token_lock:
+            try:
+                _LOGGER.debug('Refreshing OAuth2 token in the background')
+                await self._async_update_oauth2_token()
+            except Exception as err:
+                _LOGGER.warning(f'Error refreshing OAuth2 token in the background: {err}')
+
+    def _cancel_token_refresh(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    async def _ensure_token(self) -> str:
+        """
+        Get a usable access token.  Tokens are normally refreshed in the background
+        before they expire, an expired token is refreshed before returning.
+        """
+        if time.monotonic() < self._token_expiration_time:
+            return self._access_token
+
+        async with self._token_lock:
+            #another caller may have refreshed the token while we were waiting
+            if time.monotonic() >= self._token_expiration_time:
+                await self._async_update_oauth2_token()
+        return self._access_token
 
     async def _maybe_trigger_appliance_init_event(self, data: Tuple[GeAppliance, Dict[ErdCodeType, Any]]):
         """
@@ -260,16 +457,19 @@ async def _maybe_trigger_appliance_init_event(self, data: Tuple[GeAppliance, Dic
         :param data: GeAppliance updated and the updates
         """
         appliance, state_changes = data
-        if ErdCode.APPLIANCE_TYPE in state_changes and not appliance.initialized:
-            _LOGGER.debug(f'Got initial appliance type for {appliance:s}')
-            appliance.initialized = True
-            await self.async_event(EVENT_APPLIANCE_INITIAL_UPDATE, appliance)
+        if appliance.initialized or ErdCode.APPLIANCE_TYPE not in state_changes:
+            return
+        _LOGGER.debug(f'Got initial appliance type for {appliance:s}')
+        appliance.initialized = True
+        await self.async_event(EVENT_APPLIANCE_INITIAL_UPDATE, appliance)
 
     async def _set_appliance_availability(self, appliance: GeAppliance, available: bool):
-        if available and not appliance.available:
+        if available == appliance.available:
+            return
+        if available:
             appliance.set_available()
             await self.async_event(EVENT_APPLIANCE_AVAILABLE, appliance)
-        elif not available and appliance.available:
+        else:
             appliance.set_unavailable()
             await self.async_event(EVENT_APPLIANCE_UNAVAILABLE, appliance)
 
@@ -286,7 +486,16 @@ async def _set_state(self, new_state: GeClientState) -> bool:
         return False            
 
     def _initialize_event_handlers(self):
-        self._event_handlers = defaultdict(list)  # type: Dict[str, List[Callable]]
+        self._event_handlers = {
+            event: () for event in (
+                EVENT_APPLIANCE_INITIAL_UPDATE,
+                EVENT_APPLIANCE_AVAILABLE,
+                EVENT_APPLIANCE_UNAVAILABLE,
+                EVENT_CONNECTED,
+                EVENT_DISCONNECTED,
+                EVENT_STATE_CHANGED,
+            )
+        }  # type: Dict[str, Tuple[Callable, ...]]
         self.add_event_handler(EVENT_STATE_CHANGED, self._on_state_change)
         pass
 
@@ -304,7 +513,9 @@ async def disconnect(self):
             _LOGGER.info("Disconnecting")
             await self._set_state(GeClientState.DISCONNECTING)         
             self._disconnect_requested.set()
+            self._cancel_token_refresh()
             await self._disconnect()
+            await self._async_close_session()
             await self._set_state(GeClientState.DISCONNECTED) 
 
     async def _set_connected(self):
@@ -17,8 +17,21 @@
 LOGIN_REGION_COOKIE_NAME = "abgea_region"
 LOGIN_COOKIE_DOMAIN = "accounts.brillion.geappliances.com"
 
+HTTP_CONNECTION_LIMIT = 32
+HTTP_DNS_CACHE_TTL = 300
+HTTP_KEEPALIVE_TIMEOUT = 75
+
 MAX_RETRIES = 1
+# Reconnect delays start at RETRY_INTERVAL and double up to RETRY_MAX_DELAY
 RETRY_INTERVAL = 10
+RETRY_MAX_DELAY = 60.0
+# In-place request retries start at RETRY_BASE_DELAY
+RETRY_BASE_DELAY = 1.0
+RETRY_JITTER = 0.5
+OAUTH_RETRY_ATTEMPTS = 3
+
+# Seconds before token expiration at which a background refresh is started
+TOKEN_REFRESH_WINDOW = 180
 
 EVENT_ADD_APPLIANCE = "add_appliance"
 EVENT_APPLIANCE_INITIAL_UPDATE = "appliance_got_type"
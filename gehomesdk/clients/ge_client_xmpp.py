@@ -40,9 +40,14 @@ def event_handlers(self) -> Dict[str, List[Callable]]:
         return self._event_handlers
 
     async def async_event(self, event: str, *args, **kwargs):
-        """Trigger event callbacks sequentially"""
-        for cb in self.event_handlers[event]:
-            asyncio.ensure_future(cb(*args, **kwargs), loop=self.loop)
+        """Trigger event callbacks concurrently and wait for them to complete"""
+        handlers = tuple(self.event_handlers.get(event, ()))
+        if not handlers:
+            return
+        results = await asyncio.gather(*(cb(*args, **kwargs) for cb in handlers), return_exceptions=True)
+        for cb, result in zip(handlers, results):
+            if isinstance(result, Exception):
+                _LOGGER.error(f"error processing callback {cb} for event {event}", exc_info=result)
 
     def add_external_event_handler(self, event: str, callback: Callable, disposable: bool = False):
         if disposable:
@@ -70,7 +75,7 @@ async def _connect_routine(self):
 
         if self.connect_loop_wait > 0:
             self.event('reconnect_delay', self.connect_loop_wait)
-            await asyncio.sleep(self.connect_loop_wait, loop=self.loop)
+            await asyncio.sleep(self.connect_loop_wait)
 
         record = await self.pick_dns_answer(self.default_domain)
         if record is not None:
@@ -104,6 +109,4 @@ async def _connect_routine(self):
             if self._current_connection_attempt is None:
                 return
             self.connect_loop_wait = self.connect_loop_wait * 2 + 1
-            self._current_connection_attempt = asyncio.ensure_future(
-                self._connect_routine(), loop=self.loop,
-            )
+            self._current_connection_attempt = asyncio.create_task(self._connect_routine())
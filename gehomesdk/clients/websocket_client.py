@@ -41,6 +41,16 @@ class GeWebsocketClient(GeBaseClient):
     """
     client_priority = 2  # This should be the primary client
 
+    __slots__ = (
+        '_endpoint',
+        '_socket',
+        '_pending_erds',
+        '_keepalive_timeout',
+        '_keepalive_fut',
+        '_list_frequency',
+        '_list_fut',
+    )
+
     def __init__(self, username: str, password: str, region: str = "US", event_loop: Optional[asyncio.AbstractEventLoop] = None, keepalive: Optional[int] = KEEPALIVE_TIMEOUT, list_frequency: Optional[int] = LIST_APPLIANCES_FREQUENCY):
         super().__init__(username, password, region, event_loop)
         self._endpoint = None  # type: Optional[str]
@@ -80,13 +90,13 @@ async def _async_get_wss_credentials(self) -> Dict[str,str]:
         await self._set_state(GeClientState.AUTHORIZING_CLIENT)
 
         uri = f'{API_URL}/v1/websocket'
-        auth_header = { 'Authorization': 'Bearer ' + self._access_token }
+        auth_header = { 'Authorization': 'Bearer ' + await self._ensure_token() }
         async with self._session.get(uri, headers=auth_header) as resp:
             if 400 <= resp.status < 500:
                 raise GeAuthFailedError(await resp.text())
             if resp.status >= 500:
                 raise GeGeneralServerError(await resp.text())
-            return await resp.json()
+            return await resp.json(loads=json.loads)
         
     @property
     def endpoint(self) -> str:
@@ -229,9 +239,9 @@ async def async_request_features(self, appliance: GeAppliance):
 
     def _setup_futures(self):
         if self._keepalive_timeout:
-            self._keepalive_fut = asyncio.ensure_future(self._keep_alive(self._keepalive_timeout), loop=self.loop)
+            self._keepalive_fut = asyncio.create_task(self._keep_alive(self._keepalive_timeout))
         if self._list_frequency:
-            self._list_fut = asyncio.ensure_future(self._refresh_appliances(self._list_frequency), loop=self.loop)
+            self._list_fut = asyncio.create_task(self._refresh_appliances(self._list_frequency))
 
     def _teardown_futures(self):
         if self._keepalive_fut is not None:
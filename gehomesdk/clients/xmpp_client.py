@@ -34,6 +34,8 @@ def _first_or_none(lst: list) -> Any:
 class GeXmppClient(GeBaseClient):
     client_priority = 1
 
+    __slots__ = ('_client',)
+
     def __init__(self, username: str, password: str, region: str = "US", event_loop: Optional[asyncio.AbstractEventLoop] = None):
         super().__init__(username, password, region, event_loop=event_loop)
         self._client = None  # type: Optional[GeClientXMPP]
@@ -86,12 +88,12 @@ async def _async_get_mobile_device_token(self) -> str:
             'app': OAUTH2_APP_ID,
             'os': 'google_android'
         }
-        auth_header = { 'Authorization': 'Bearer ' + self._access_token }
+        auth_header = { 'Authorization': 'Bearer ' + await self._ensure_token() }
 
         async with self._session.post(f'{API_URL}/v1/mdt', json=mdt_data, headers=auth_header) as resp:
             if resp.status != 200:
                 raise GeAuthFailedError(await resp.text())
-            results = await resp.json()
+            results = await resp.json(loads=json.loads)
         try:
             return results['mdt']
         except KeyError:
@@ -104,14 +106,14 @@ async def _async_get_ge_token(self, mobile_device_token: str) -> str:
             'client_secret': OAUTH2_CLIENT_SECRET,
             'mdt': mobile_device_token
         }
-        auth_header = { 'Authorization': 'Bearer ' + self._access_token }
+        auth_header = { 'Authorization': 'Bearer ' + await self._ensure_token() }
 
         async with self._session.post(f'{LOGIN_URL}/oauth2/getoken', params=params, headers=auth_header) as resp:
             if 400 <= resp.status < 500:
                 raise GeAuthFailedError(await resp.text())
             if resp.status >= 500:
                 raise GeGeneralServerError(await resp.text())
-            results = await resp.json()
+            results = await resp.json(loads=json.loads)
 
         try:
             return results['access_token']
@@ -127,7 +129,7 @@ async def _async_get_xmpp_credentials(self, ge_token: str) -> Dict:
                 raise GeAuthFailedError(await resp.text())
             if resp.status >= 500:
                 raise GeGeneralServerError(await resp.text())
-            return await resp.json()
+            return await resp.json(loads=json.loads)
 
     async def _async_run_client(self):
         """Run the client."""
@@ -137,7 +139,7 @@ async def _async_run_client(self):
             self._client = self._get_xmpp_client()
             self._client.connect(address=address)
             #run the loop
-            await asyncio.ensure_future(self._client.disconnected, loop=self.loop)
+            await self._client.disconnected
         #TODO: better exception handling
         except Exception as err:
             _LOGGER.error(f"Exception while processing XMPP loop: {err}")
@@ -2,7 +2,6 @@
 Gets the appliance data, continues to run until cancelled so that values can be observed.
 """
 
-import aiohttp
 import asyncio
 import logging
 from datetime import timedelta
@@ -19,6 +18,9 @@
 
 _LOGGER = logging.getLogger(__name__)
 
+# Keep references to running tasks so they aren't garbage collected
+_BACKGROUND_TASKS = set()
+
 async def log_state_change(data: Tuple[GeAppliance, Dict[ErdCodeType, Any]]):
     """Log changes in appliance state"""
     appliance, state_changes = data
@@ -42,6 +44,12 @@ async def do_periodic_update(appliance: GeAppliance):
         _LOGGER.debug(f'Requesting update for {appliance:s}')
         await appliance.async_request_update()
 
+async def start_periodic_update(appliance: GeAppliance):
+    """Event callbacks are awaited, so run the periodic update in its own task"""
+    task = asyncio.create_task(do_periodic_update(appliance))
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+
 def gather_appliance_data(username: str, password: str, region: str):
     logging.basicConfig(level=logging.DEBUG, format='%(asctime)-15s %(levelname)-8s %(message)s')
 
@@ -49,8 +57,7 @@ def gather_appliance_data(username: str, password: str, region: str):
     client = GeWebsocketClient(username, password, region, loop)
     client.add_event_handler(EVENT_APPLIANCE_INITIAL_UPDATE, detect_appliance_type)
     client.add_event_handler(EVENT_APPLIANCE_STATE_CHANGE, log_state_change)
-    client.add_event_handler(EVENT_ADD_APPLIANCE, do_periodic_update)
+    client.add_event_handler(EVENT_ADD_APPLIANCE, start_periodic_update)
 
-    session = aiohttp.ClientSession()
-    asyncio.ensure_future(client.async_get_credentials_and_run(session), loop=loop)
+    asyncio.ensure_future(client.async_get_credentials_and_run(), loop=loop)
     loop.run_until_complete(asyncio.sleep(7400))
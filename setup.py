@@ -45,5 +45,5 @@
     },    
     packages=find_namespace_packages(include=[base_package, f"{base_package}*"]),
     include_package_data=False,
-    install_requires=["aiohttp", "bidict", "requests", "websockets","humanize", "lxml", "slixmpp"]
+    install_requires=["aiohttp", "yarl", "bidict", "requests", "websockets","humanize", "lxml", "slixmpp"]
 )
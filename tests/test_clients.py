@@ -0,0 +1,25 @@
+"""Test client instance behaviour."""
+import weakref
+
+from gehomesdk import GeWebsocketClient
+from gehomesdk.clients.const import RETRY_INTERVAL, RETRY_JITTER, RETRY_MAX_DELAY
+
+
+def test_client_supports_weakref():
+    client = GeWebsocketClient("user@example.com", "password")
+    assert weakref.ref(client)() is client
+
+
+def test_retry_delay_bounds():
+    client = GeWebsocketClient("user@example.com", "password")
+    for retries in range(-1, 10):
+        client._retries_since_last_connect = retries
+        for _ in range(20):
+            delay = client._get_retry_delay()
+            assert RETRY_INTERVAL <= delay <= RETRY_MAX_DELAY * (1 + RETRY_JITTER)
+
+
+def test_retry_delay_doubles():
+    client = GeWebsocketClient("user@example.com", "password")
+    client._retries_since_last_connect = 1
+    assert client._get_retry_delay() >= 2 * RETRY_INTERVAL
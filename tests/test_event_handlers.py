@@ -0,0 +1,21 @@
+"""Test client event handler registration."""
+import asyncio
+
+from gehomesdk import GeWebsocketClient
+
+
+def test_remove_event_handler():
+    calls = []
+
+    async def callback(*args):
+        calls.append(args)
+
+    async def run():
+        client = GeWebsocketClient("user@example.com", "password")
+        client.add_event_handler("test_event", callback)
+        await client.async_event("test_event", 1)
+        client.remove_event_handler("test_event", callback)
+        await client.async_event("test_event", 2)
+
+    asyncio.run(run())
+    assert calls == [(1,)]
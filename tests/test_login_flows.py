@@ -0,0 +1,78 @@
+"""Test parsing of the login pages."""
+from gehomesdk.clients.async_login_flows import _ALERT_RE, _get_signin_form_values
+
+
+def test_form_values_attribute_order():
+    html = '''<form id="frmsignin"><input name="a" value="1"><input value="2" type="hidden" name="b"></form>'''
+    assert _get_signin_form_values(html) == {'a': '1', 'b': '2'}
+
+
+def test_form_values_quoting():
+    html = '''<form id="frmsignin"><input name="a" value="1"><input name='b' value='2'><input name=c value=3></form>'''
+    assert _get_signin_form_values(html) == {'a': '1', 'b': '2', 'c': '3'}
+
+
+def test_form_values_entities():
+    html = '''<form id="frmsignin"><input name="signature" value="a&amp;b&quot;c"></form>'''
+    assert _get_signin_form_values(html) == {'signature': 'a&b"c'}
+
+
+def test_form_values_skip_inputs_without_value():
+    html = '''<form id="frmsignin"><input name="username" type="text"><input name="empty" value=""></form>'''
+    assert _get_signin_form_values(html) == {'empty': ''}
+
+
+def test_form_values_only_signin_form():
+    html = '''
+        <form id="other"><input name="x" value="1"></form>
+        <form method="post" id=frmsignin action="/oauth2/code"><input name="y" value="2"></form>
+    '''
+    assert _get_signin_form_values(html) == {'y': '2'}
+
+
+def test_form_values_missing_form():
+    assert _get_signin_form_values('<form id="frmsignin2"><input name="x" value="1"></form>') == {}
+
+
+def test_form_values_consent_form():
+    html = '''
+        <form id='frmsignin' method='post' action='/oauth2/code'>
+            <input type='hidden' name='client_id' value='564c31616c4f7474434b307435412b4d2f6e7672' />
+            <input type='hidden' name='state' value='' />
+            <input type='hidden' name='authorized' value='' />
+            <button type='submit'>Allow</button>
+        </form>
+    '''
+    values = _get_signin_form_values(html)
+    assert 'authorized' in values
+    assert values['client_id'] == '564c31616c4f7474434b307435412b4d2f6e7672'
+    assert values['state'] == ''
+
+
+def test_alert_pane():
+    html = '''<div class="alert" id="alert_pane">\n\tIncorrect username or password\n</div>'''
+    assert _ALERT_RE.search(html).group(1).strip() == 'Incorrect username or password'
+
+
+def test_alert_pane_unquoted():
+    html = '''<div id=alert_pane>Locked</div>'''
+    assert _ALERT_RE.search(html).group(1) == 'Locked'
+
+
+def test_alert_pane_missing():
+    assert _ALERT_RE.search('<div id="alert_pane_2">nope</div>') is None
+
+
+def test_form_values_gt_in_quoted_value():
+    html = '''<form id="frmsignin"><input name="a" value="x>y"><input name='b' value='1>2'></form>'''
+    assert _get_signin_form_values(html) == {'a': 'x>y', 'b': '1>2'}
+
+
+def test_form_values_skip_commented_inputs():
+    html = '''
+        <form id="frmsignin">
+            <!-- <input name="old" value="1"> -->
+            <input name="new" value="2">
+        </form>
+    '''
+    assert _get_signin_form_values(html) == {'new': '2'}
@@ -0,0 +1,78 @@
+"""Test retrying of OAuth requests."""
+import asyncio
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from gehomesdk.clients import async_login_flows
+from gehomesdk.clients.async_login_flows import _async_oauth_post
+from gehomesdk.clients.const import OAUTH_RETRY_ATTEMPTS
+from gehomesdk.exception import GeAuthFailedError, GeGeneralServerError
+
+
+class _FakeResponse:
+    def __init__(self, status: int, body: dict = None):
+        self.status = status
+        self._body = body or {}
+
+    async def json(self, loads=None):
+        return self._body
+
+
+class _FakeRequest:
+    def __init__(self, outcome):
+        self._outcome = outcome
+
+    async def __aenter__(self):
+        if isinstance(self._outcome, BaseException):
+            raise self._outcome
+        return self._outcome
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+class _FakeSession:
+    """Returns the given outcomes in order, an outcome is a response or an exception to raise"""
+
+    def __init__(self, *outcomes):
+        self._outcomes = list(outcomes)
+        self.calls = 0
+
+    def post(self, url, data=None, auth=None):
+        self.calls += 1
+        return _FakeRequest(self._outcomes.pop(0))
+
+
+def _post(monkeypatch, session):
+    monkeypatch.setattr(async_login_flows, 'RETRY_BASE_DELAY', 0)
+    return asyncio.run(_async_oauth_post(session, 'https://example.com/token', {}))
+
+
+def test_retries_server_errors(monkeypatch):
+    session = _FakeSession(_FakeResponse(503), _FakeResponse(200, {'access_token': 'token'}))
+    assert _post(monkeypatch, session) == {'access_token': 'token'}
+    assert session.calls == 2
+
+
+def test_retries_connection_errors_and_timeouts(monkeypatch):
+    session = _FakeSession(
+        ClientConnectionError(),
+        asyncio.TimeoutError(),
+        _FakeResponse(200, {'access_token': 'token'}))
+    assert _post(monkeypatch, session) == {'access_token': 'token'}
+    assert session.calls == 3
+
+
+def test_does_not_retry_auth_failures(monkeypatch):
+    session = _FakeSession(_FakeResponse(401), _FakeResponse(200))
+    with pytest.raises(GeAuthFailedError):
+        _post(monkeypatch, session)
+    assert session.calls == 1
+
+
+def test_raises_after_last_attempt(monkeypatch):
+    session = _FakeSession(*[_FakeResponse(500) for _ in range(OAUTH_RETRY_ATTEMPTS + 1)])
+    with pytest.raises(GeGeneralServerError):
+        _post(monkeypatch, session)
+    assert session.calls == OAUTH_RETRY_ATTEMPTS
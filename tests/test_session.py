@@ -0,0 +1,78 @@
+"""Test the lifecycle of the client owned HTTP session."""
+import asyncio
+
+import pytest
+from aiohttp import ClientSession
+
+from gehomesdk import GeWebsocketClient
+
+
+class _TestClient(GeWebsocketClient):
+    """Websocket client that records the session used to log in"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.login_sessions = []
+
+    async def _async_do_full_login_flow(self):
+        self.login_sessions.append(self._session)
+        assert not self._session.closed
+        return {}
+
+    async def _async_run_client(self):
+        await self._set_connected()
+        await self._disconnect_requested.wait()
+
+
+def test_credentials_call_closes_owned_session():
+    async def run():
+        client = _TestClient("user@example.com", "password")
+        await client.async_get_credentials()
+        assert client.login_sessions[0].closed
+
+        #a later call gets a new session
+        await client.async_get_credentials()
+        assert client.login_sessions[1] is not client.login_sessions[0]
+        assert client.login_sessions[1].closed
+
+    asyncio.run(run())
+
+
+def test_context_manager_keeps_session():
+    async def run():
+        async with _TestClient("user@example.com", "password") as client:
+            await client.async_get_credentials()
+            await client.async_get_credentials()
+            session = client.login_sessions[0]
+            assert client.login_sessions[1] is session
+            assert not session.closed
+        assert session.closed
+
+    asyncio.run(run())
+
+
+def test_run_closes_owned_session():
+    async def run():
+        client = _TestClient("user@example.com", "password")
+        run_task = asyncio.create_task(client.async_get_credentials_and_run())
+        await asyncio.sleep(0.05)
+        session = client.login_sessions[0]
+        assert not session.closed
+        await client.disconnect()
+        await run_task
+        assert session.closed
+
+    asyncio.run(run())
+
+
+def test_passed_session_is_not_closed():
+    async def run():
+        session = ClientSession()
+        client = _TestClient("user@example.com", "password")
+        with pytest.warns(DeprecationWarning):
+            await client.async_get_credentials(session)
+        assert client.login_sessions[0] is session
+        assert not session.closed
+        await session.close()
+
+    asyncio.run(run())
@@ -0,0 +1,105 @@
+"""Test OAuth2 token refresh scheduling."""
+import asyncio
+import time
+
+from gehomesdk import GeWebsocketClient
+from gehomesdk.clients import base_client
+
+
+class _TestClient(GeWebsocketClient):
+    """Websocket client that runs until disconnected without opening a socket"""
+
+    async def _async_do_full_login_flow(self):
+        await self._async_get_oauth2_token()
+        return {}
+
+    async def _async_run_client(self):
+        await self._set_connected()
+        await self._disconnect_requested.wait()
+
+
+def _patch_token_flows(monkeypatch, expires_in: float = 120.2):
+    """Replace the OAuth2 requests, tokens live for expires_in - 120 seconds"""
+    calls = []
+
+    async def get_token(session, username, password, region):
+        assert session is not None and not session.closed
+        calls.append('get')
+        return {'access_token': f'token{len(calls)}', 'expires_in': expires_in, 'refresh_token': 'refresh'}
+
+    async def refresh_token(session, token):
+        assert session is not None and not session.closed
+        calls.append('refresh')
+        return {'access_token': f'token{len(calls)}', 'expires_in': expires_in, 'refresh_token': 'refresh'}
+
+    monkeypatch.setattr(base_client, 'async_get_oauth2_token', get_token)
+    monkeypatch.setattr(base_client, 'async_refresh_oauth2_token', refresh_token)
+    monkeypatch.setattr(base_client, 'TOKEN_REFRESH_WINDOW', 0.15)
+    return calls
+
+
+def _background_refresh_tasks():
+    return [t for t in asyncio.all_tasks() if '_async_background_refresh' in repr(t.get_coro())]
+
+
+def test_ensure_token_refreshes_expired_token(monkeypatch):
+    calls = _patch_token_flows(monkeypatch)
+
+    async def run():
+        async with _TestClient("user@example.com", "password") as client:
+            await client.async_get_credentials()
+            assert await client._ensure_token() == 'token1'
+            client._token_expiration_time = time.monotonic() - 1
+            assert await client._ensure_token() == 'token2'
+
+    asyncio.run(run())
+    assert calls == ['get', 'refresh']
+
+
+def test_background_refresh_while_running(monkeypatch):
+    calls = _patch_token_flows(monkeypatch)
+
+    async def run():
+        client = _TestClient("user@example.com", "password")
+        await client.async_get_credentials()
+        run_task = asyncio.create_task(client.async_run_client())
+        await asyncio.sleep(0.35)
+        #each refresh schedules the next one
+        assert calls.count('refresh') >= 2
+
+        await client.disconnect()
+        await run_task
+        refreshes = calls.count('refresh')
+        assert not _background_refresh_tasks()
+        await asyncio.sleep(0.25)
+        assert calls.count('refresh') == refreshes
+
+    asyncio.run(run())
+
+
+def test_no_background_refresh_without_running(monkeypatch):
+    calls = _patch_token_flows(monkeypatch)
+
+    async def run():
+        client = _TestClient("user@example.com", "password")
+        await client.async_get_credentials()
+        assert not _background_refresh_tasks()
+        await asyncio.sleep(0.25)
+
+    asyncio.run(run())
+    assert calls == ['get']
+
+
+def test_context_manager_exit_cancels_refresh(monkeypatch):
+    _patch_token_flows(monkeypatch)
+
+    async def run():
+        async with _TestClient("user@example.com", "password") as client:
+            await client.async_get_credentials()
+            run_task = asyncio.create_task(client.async_run_client())
+            await asyncio.sleep(0.05)
+            assert _background_refresh_tasks()
+        await run_task
+        assert not _background_refresh_tasks()
+
+    asyncio.run(run())